@@ -6,18 +6,219 @@ Usage: Can be run in Google Colab or any Python environment
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import json
+import os
 import time
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import re
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+try:
+    import anthropic
+except ImportError:  # AI classification is optional
+    anthropic = None
+
+try:
+    from openpyxl.utils import get_column_letter
+except ImportError:  # Only needed for Excel export
+    get_column_letter = None
+
+# Configure logging (TRIALSCOPE_LOG_LEVEL=WARNING silences per-search progress)
+_LOG_LEVEL = os.environ.get('TRIALSCOPE_LOG_LEVEL', 'INFO').upper()
+if not isinstance(logging.getLevelName(_LOG_LEVEL), int):
+    _LOG_LEVEL = 'INFO'  # unknown level names would make basicConfig raise
+logging.basicConfig(level=_LOG_LEVEL,
+                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds a completed search is served from the in-memory cache
+SEARCH_CACHE_TTL = 600
+
+# Entries kept per cache before the oldest are evicted
+SEARCH_CACHE_MAX_ENTRIES = 128
+
+# Number of trials sent to Anthropic in a single classification request
+AI_BATCH_SIZE = 10
+
+# Maximum classification requests in flight at once
+AI_MAX_CONCURRENCY = 8
+
+# Classified trials remembered per (query, trial); a search returns dozens
+AI_CACHE_MAX_ENTRIES = 2048
+
+# Fields written by AI classification, replayed from the cache on a hit
+AI_RESULT_FIELDS = ('ai_score', 'ai_classification', 'confidence', 'ai_reasoning')
+
+# Classification instructions shared by every batch; only the query and
+# trials vary, and they go in the user message
+AI_SYSTEM_PROMPT = """You analyze clinical trials for relevance to a search query.
+
+Provide a JSON array with one object per trial, each with:
+- id: the trial number shown in the message
+- relevance_score: 0-100 (how relevant to the query)
+- classification: "Highly Relevant", "Relevant", or "Less Relevant"
+- confidence: 0-100 (confidence in classification)
+- reasoning: Brief explanation"""
+
+# Seconds before a stalled classification request is abandoned
+AI_REQUEST_TIMEOUT = 60.0
+
+# Keep-alive connections held per registry host by the shared session
+HTTP_POOL_SIZE = 16
+
+# ClinicalTrials.gov fields requested for every search
+CTGOV_FIELDS = ('NCTId,BriefTitle,OfficialTitle,Condition,BriefSummary,DetailedDescription,'
+                'PrimaryOutcomeMeasure,StudyType,Phase,OverallStatus,StartDate,CompletionDate,'
+                'Sponsor,Location,InterventionName,ArmGroupLabel')
+
+# Patterns applied per record, compiled once
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+# Trial field -> Excel column header, in sheet order
+EXCEL_COLUMNS = {
+    'title': 'Title',
+    'url': 'URL',
+    'source': 'Source',
+    'abstract': 'Abstract',
+    'ai_score': 'AI_Score',
+    'ai_classification': 'AI_Classification',
+    'confidence': 'Confidence',
+    'conditions': 'Conditions',
+    'phase': 'Phase',
+    'status': 'Status',
+    'start_date': 'Start_Date',
+    'sponsor': 'Sponsor',
+    'interventions': 'Interventions',
+    'nct_id': 'NCT_ID'
+}
+
+# Complete Registry configurations - All 16 Global Registries
+REGISTRIES = {
+    'clinicaltrials_gov': {
+        'name': 'ClinicalTrials.gov',
+        'url': 'https://clinicaltrials.gov/api/v2',
+        'api_type': 'rest',
+        'trials': 450000,
+        'status': 'operational'
+    },
+    'eu_ctis': {
+        'name': 'EU Clinical Trial Information System',
+        'url': 'https://euclinicaltrials.eu/ctis-public',
+        'api_type': 'scraping',
+        'trials': 85000,
+        'status': 'operational'
+    },
+    'isrctn': {
+        'name': 'ISRCTN Registry',
+        'url': 'https://www.isrctn.com',
+        'api_type': 'rest',
+        'trials': 45000,
+        'status': 'operational'
+    },
+    'ctri': {
+        'name': 'Clinical Trials Registry - India',
+        'url': 'http://ctri.nic.in',
+        'api_type': 'scraping',
+        'trials': 25000,
+        'status': 'operational'
+    },
+    'anzctr': {
+        'name': 'Australian New Zealand Clinical Trials Registry',
+        'url': 'https://www.anzctr.org.au',
+        'api_type': 'rest',
+        'trials': 18000,
+        'status': 'operational'
+    },
+    'drks': {
+        'name': 'German Clinical Trials Register',
+        'url': 'https://www.drks.de',
+        'api_type': 'scraping',
+        'trials': 15000,
+        'status': 'operational'
+    },
+    'jrct': {
+        'name': 'Japan Registry of Clinical Trials',
+        'url': 'https://jrct.niph.go.jp',
+        'api_type': 'scraping',
+        'trials': 12000,
+        'status': 'operational'
+    },
+    'irct': {
+        'name': 'Iranian Registry of Clinical Trials',
+        'url': 'https://www.irct.ir',
+        'api_type': 'scraping',
+        'trials': 8000,
+        'status': 'operational'
+    },
+    'tctr': {
+        'name': 'Thai Clinical Trials Registry',
+        'url': 'http://www.clinicaltrials.in.th',
+        'api_type': 'scraping',
+        'trials': 5000,
+        'status': 'operational'
+    },
+    'rpcec': {
+        'name': 'Cuban Public Registry of Clinical Trials',
+        'url': 'http://registroclinico.sld.cu',
+        'api_type': 'scraping',
+        'trials': 3000,
+        'status': 'limited'
+    },
+    'pactr': {
+        'name': 'Pan African Clinical Trial Registry',
+        'url': 'https://pactr.samrc.ac.za',
+        'api_type': 'scraping',
+        'trials': 2500,
+        'status': 'operational'
+    },
+    'cris': {
+        'name': 'Clinical Research Information Service - Korea',
+        'url': 'https://cris.nih.go.kr',
+        'api_type': 'scraping',
+        'trials': 4000,
+        'status': 'operational'
+    },
+    'slctr': {
+        'name': 'Sri Lanka Clinical Trials Registry',
+        'url': 'https://slctr.lk',
+        'api_type': 'scraping',
+        'trials': 1500,
+        'status': 'operational'
+    },
+    'repec': {
+        'name': 'Peruvian Clinical Trial Registry',
+        'url': 'https://ensayosclinicos-repec.ins.gob.pe',
+        'api_type': 'scraping',
+        'trials': 1000,
+        'status': 'operational'
+    },
+    'lbctr': {
+        'name': 'Lebanese Clinical Trials Registry',
+        'url': 'https://lbctr.moph.gov.lb',
+        'api_type': 'scraping',
+        'trials': 800,
+        'status': 'limited'
+    },
+    'who_ictrp': {
+        'name': 'WHO International Clinical Trials Registry Platform',
+        'url': 'https://trialsearch.who.int',
+        'api_type': 'rest',
+        'trials': 500000,
+        'status': 'operational'
+    }
+}
+
 class TrialScopeAPI:
     """Standalone API client for clinical trial searches"""
     
@@ -37,122 +238,32 @@ class TrialScopeAPI:
             'User-Agent': 'TrialScope-AI/1.0 (Clinical Research Tool)',
             'Accept': 'application/json'
         })
+        # Pool enough connections for the concurrent source fan-out and
+        # retry transient gateway errors with backoff. Read timeouts are not
+        # retried, so a stalled registry costs one timeout, not four.
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, connect=1, read=0, backoff_factor=0.3,
+                              status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
-        # Complete Registry configurations - All 16 Global Registries
-        self.registries = {
-            'clinicaltrials_gov': {
-                'name': 'ClinicalTrials.gov',
-                'url': 'https://clinicaltrials.gov/api/v2',
-                'api_type': 'rest',
-                'trials': 450000,
-                'status': 'operational'
-            },
-            'eu_ctis': {
-                'name': 'EU Clinical Trial Information System',
-                'url': 'https://euclinicaltrials.eu/ctis-public',
-                'api_type': 'scraping',
-                'trials': 85000,
-                'status': 'operational'
-            },
-            'isrctn': {
-                'name': 'ISRCTN Registry',
-                'url': 'https://www.isrctn.com',
-                'api_type': 'rest',
-                'trials': 45000,
-                'status': 'operational'
-            },
-            'ctri': {
-                'name': 'Clinical Trials Registry - India',
-                'url': 'http://ctri.nic.in',
-                'api_type': 'scraping',
-                'trials': 25000,
-                'status': 'operational'
-            },
-            'anzctr': {
-                'name': 'Australian New Zealand Clinical Trials Registry',
-                'url': 'https://www.anzctr.org.au',
-                'api_type': 'rest',
-                'trials': 18000,
-                'status': 'operational'
-            },
-            'drks': {
-                'name': 'German Clinical Trials Register',
-                'url': 'https://www.drks.de',
-                'api_type': 'scraping',
-                'trials': 15000,
-                'status': 'operational'
-            },
-            'jrct': {
-                'name': 'Japan Registry of Clinical Trials',
-                'url': 'https://jrct.niph.go.jp',
-                'api_type': 'scraping',
-                'trials': 12000,
-                'status': 'operational'
-            },
-            'irct': {
-                'name': 'Iranian Registry of Clinical Trials',
-                'url': 'https://www.irct.ir',
-                'api_type': 'scraping',
-                'trials': 8000,
-                'status': 'operational'
-            },
-            'tctr': {
-                'name': 'Thai Clinical Trials Registry',
-                'url': 'http://www.clinicaltrials.in.th',
-                'api_type': 'scraping',
-                'trials': 5000,
-                'status': 'operational'
-            },
-            'rpcec': {
-                'name': 'Cuban Public Registry of Clinical Trials',
-                'url': 'http://registroclinico.sld.cu',
-                'api_type': 'scraping',
-                'trials': 3000,
-                'status': 'limited'
-            },
-            'pactr': {
-                'name': 'Pan African Clinical Trial Registry',
-                'url': 'https://pactr.samrc.ac.za',
-                'api_type': 'scraping',
-                'trials': 2500,
-                'status': 'operational'
-            },
-            'cris': {
-                'name': 'Clinical Research Information Service - Korea',
-                'url': 'https://cris.nih.go.kr',
-                'api_type': 'scraping',
-                'trials': 4000,
-                'status': 'operational'
-            },
-            'slctr': {
-                'name': 'Sri Lanka Clinical Trials Registry',
-                'url': 'https://slctr.lk',
-                'api_type': 'scraping',
-                'trials': 1500,
-                'status': 'operational'
-            },
-            'repec': {
-                'name': 'Peruvian Clinical Trial Registry',
-                'url': 'https://ensayosclinicos-repec.ins.gob.pe',
-                'api_type': 'scraping',
-                'trials': 1000,
-                'status': 'operational'
-            },
-            'lbctr': {
-                'name': 'Lebanese Clinical Trials Registry',
-                'url': 'https://lbctr.moph.gov.lb',
-                'api_type': 'scraping',
-                'trials': 800,
-                'status': 'limited'
-            },
-            'who_ictrp': {
-                'name': 'WHO International Clinical Trials Registry Platform',
-                'url': 'https://trialsearch.who.int',
-                'api_type': 'rest',
-                'trials': 500000,
-                'status': 'operational'
-            }
-        }
+        # Completed searches keyed by their arguments: key -> (timestamp, results)
+        self._search_cache: Dict[tuple, tuple] = {}
+        # Per-source results keyed by (source, query, max_results), same layout
+        self._source_cache: Dict[tuple, tuple] = {}
+        # Source searches write their cache entries from worker threads
+        self._cache_lock = threading.Lock()
+        
+        self.registries = REGISTRIES
+        
+        # AI results keyed by (query, source, url, title), same layout as above
+        self._ai_cache: Dict[tuple, tuple] = {}
+        
+        # Anthropic client, created on first classification and reused after
+        self._anthropic_client = None
     
     def search_clinicaltrials_gov(self, query: str, max_results: int = 50) -> List[Dict]:
         """
@@ -165,7 +276,7 @@ class TrialScopeAPI:
         Returns:
             List of trial dictionaries
         """
-        logger.info(f"Searching ClinicalTrials.gov for: {query}")
+        logger.info("Searching ClinicalTrials.gov for: %s", query)
         
         try:
             # Construct search parameters
@@ -173,7 +284,7 @@ class TrialScopeAPI:
                 'query.cond': query,
                 'query.term': query,
                 'format': 'json',
-                'fields': 'NCTId,BriefTitle,OfficialTitle,Condition,BriefSummary,DetailedDescription,PrimaryOutcomeMeasure,StudyType,Phase,OverallStatus,StartDate,CompletionDate,Sponsor,Location,InterventionName,ArmGroupLabel',
+                'fields': CTGOV_FIELDS,
                 'min_rnk': 1,
                 'max_rnk': max_results,
                 'sort': 'EnrollmentCount:desc'
@@ -185,7 +296,7 @@ class TrialScopeAPI:
             data = response.json()
             studies = data.get('studies', [])
             
-            logger.info(f"Found {len(studies)} trials from ClinicalTrials.gov")
+            logger.info("Found %s trials from ClinicalTrials.gov", len(studies))
             
             # Process results
             processed_trials = []
@@ -218,8 +329,8 @@ class TrialScopeAPI:
                     
                     # Clean abstract text
                     if abstract and isinstance(abstract, str):
-                        abstract = re.sub(r'<[^>]+>', '', abstract)  # Remove HTML tags
-                        abstract = re.sub(r'\s+', ' ', abstract).strip()  # Clean whitespace
+                        abstract = HTML_TAG_RE.sub('', abstract)  # Remove HTML tags
+                        abstract = WHITESPACE_RE.sub(' ', abstract).strip()  # Clean whitespace
                     
                     processed_trial = {
                         'title': title,
@@ -239,16 +350,16 @@ class TrialScopeAPI:
                     processed_trials.append(processed_trial)
                     
                 except Exception as e:
-                    logger.warning(f"Error processing trial: {e}")
+                    logger.warning("Error processing trial: %s", e)
                     continue
             
             return processed_trials
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
+            logger.error("API request failed: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Search failed: {e}")
+            logger.error("Search failed: %s", e)
             return []
     
     def search_google_scholar(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -262,7 +373,7 @@ class TrialScopeAPI:
         Returns:
             List of paper dictionaries
         """
-        logger.info(f"Searching Google Scholar for: {query}")
+        logger.info("Searching Google Scholar for: %s", query)
         
         if not self.serpapi_key:
             logger.warning("No SerpAPI key provided. Skipping Google Scholar search.")
@@ -299,14 +410,14 @@ class TrialScopeAPI:
                     }
                     papers.append(paper)
                 except Exception as e:
-                    logger.warning(f"Error processing Scholar result: {e}")
+                    logger.warning("Error processing Scholar result: %s", e)
                     continue
             
-            logger.info(f"Found {len(papers)} Google Scholar articles")
+            logger.info("Found %s Google Scholar articles", len(papers))
             return papers
             
         except Exception as e:
-            logger.error(f"Google Scholar search failed: {e}")
+            logger.error("Google Scholar search failed: %s", e)
             return []
 
     def search_pubmed_related(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -320,7 +431,7 @@ class TrialScopeAPI:
         Returns:
             List of paper dictionaries
         """
-        logger.info(f"Searching PubMed for: {query}")
+        logger.info("Searching PubMed for: %s", query)
         
         try:
             # Use NCBI E-utilities API
@@ -368,11 +479,11 @@ class TrialScopeAPI:
                 }
                 papers.append(paper)
             
-            logger.info(f"Found {len(papers)} PubMed articles")
+            logger.info("Found %s PubMed articles", len(papers))
             return papers
             
         except Exception as e:
-            logger.error(f"PubMed search failed: {e}")
+            logger.error("PubMed search failed: %s", e)
             return []
     
     def search_isrctn_registry(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -386,7 +497,7 @@ class TrialScopeAPI:
         Returns:
             List of trial dictionaries
         """
-        logger.info(f"Searching ISRCTN Registry for: {query}")
+        logger.info("Searching ISRCTN Registry for: %s", query)
         
         try:
             # ISRCTN search endpoint
@@ -408,21 +519,22 @@ class TrialScopeAPI:
             # Note: This is a simplified implementation
             # In production, you would need proper HTML parsing
             for i in range(min(max_results, 10)):
+                registry_id = f'ISRCTN{i+1:08d}'
                 trial = {
                     'title': f'ISRCTN Clinical Trial {i+1}',
-                    'url': f'https://www.isrctn.com/ISRCTN{str(i+1).zfill(8)}',
+                    'url': f'https://www.isrctn.com/{registry_id}',
                     'source': 'ISRCTN Registry',
                     'abstract': f'Clinical trial from ISRCTN registry related to {query}',
-                    'registry_id': f'ISRCTN{str(i+1).zfill(8)}',
+                    'registry_id': registry_id,
                     'status': 'Active'
                 }
                 trials.append(trial)
             
-            logger.info(f"Found {len(trials)} trials from ISRCTN")
+            logger.info("Found %s trials from ISRCTN", len(trials))
             return trials
             
         except Exception as e:
-            logger.error(f"ISRCTN search failed: {e}")
+            logger.error("ISRCTN search failed: %s", e)
             return []
     
     def search_anzctr_registry(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -436,7 +548,7 @@ class TrialScopeAPI:
         Returns:
             List of trial dictionaries
         """
-        logger.info(f"Searching ANZCTR for: {query}")
+        logger.info("Searching ANZCTR for: %s", query)
         
         try:
             # ANZCTR search endpoint
@@ -452,21 +564,22 @@ class TrialScopeAPI:
             # Parse response (simplified)
             trials = []
             for i in range(min(max_results, 8)):
+                actrn = 12620000000000 + i
                 trial = {
                     'title': f'ANZCTR Clinical Trial: {query} Study {i+1}',
-                    'url': f'https://www.anzctr.org.au/Trial/Registration/TrialReview.aspx?ACTRN={12620000000000 + i}',
+                    'url': f'https://www.anzctr.org.au/Trial/Registration/TrialReview.aspx?ACTRN={actrn}',
                     'source': 'ANZCTR',
                     'abstract': f'Australian/New Zealand clinical trial studying {query}',
-                    'registry_id': f'ACTRN{12620000000000 + i}',
+                    'registry_id': f'ACTRN{actrn}',
                     'status': 'Recruiting'
                 }
                 trials.append(trial)
             
-            logger.info(f"Found {len(trials)} trials from ANZCTR")
+            logger.info("Found %s trials from ANZCTR", len(trials))
             return trials
             
         except Exception as e:
-            logger.error(f"ANZCTR search failed: {e}")
+            logger.error("ANZCTR search failed: %s", e)
             return []
     
     def search_who_ictrp(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -480,7 +593,7 @@ class TrialScopeAPI:
         Returns:
             List of trial dictionaries
         """
-        logger.info(f"Searching WHO ICTRP for: {query}")
+        logger.info("Searching WHO ICTRP for: %s", query)
         
         try:
             # WHO ICTRP search endpoint
@@ -495,23 +608,24 @@ class TrialScopeAPI:
             
             # Parse response (simplified implementation)
             trials = []
+            compact_query = query.replace(" ", "")
             for i in range(min(max_results, 15)):
                 trial = {
                     'title': f'WHO ICTRP Global Trial: {query} Research {i+1}',
-                    'url': f'https://trialsearch.who.int/Trial2.aspx?TrialID={query.replace(" ", "")}{i+1}',
+                    'url': f'https://trialsearch.who.int/Trial2.aspx?TrialID={compact_query}{i+1}',
                     'source': 'WHO ICTRP',
                     'abstract': f'International clinical trial from WHO registry studying {query}',
-                    'registry_id': f'WHO-{query.replace(" ", "")}-{i+1}',
+                    'registry_id': f'WHO-{compact_query}-{i+1}',
                     'status': 'Active',
                     'region': 'Global'
                 }
                 trials.append(trial)
             
-            logger.info(f"Found {len(trials)} trials from WHO ICTRP")
+            logger.info("Found %s trials from WHO ICTRP", len(trials))
             return trials
             
         except Exception as e:
-            logger.error(f"WHO ICTRP search failed: {e}")
+            logger.error("WHO ICTRP search failed: %s", e)
             return []
     
     def search_eu_ctis(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -525,7 +639,7 @@ class TrialScopeAPI:
         Returns:
             List of trial dictionaries
         """
-        logger.info(f"Searching EU CTIS for: {query}")
+        logger.info("Searching EU CTIS for: %s", query)
         
         try:
             # EU CTIS search (simplified implementation)
@@ -543,11 +657,11 @@ class TrialScopeAPI:
                 }
                 trials.append(trial)
             
-            logger.info(f"Found {len(trials)} trials from EU CTIS")
+            logger.info("Found %s trials from EU CTIS", len(trials))
             return trials
             
         except Exception as e:
-            logger.error(f"EU CTIS search failed: {e}")
+            logger.error("EU CTIS search failed: %s", e)
             return []
     
     def search_ctri_india(self, query: str, max_results: int = 20) -> List[Dict]:
@@ -561,7 +675,7 @@ class TrialScopeAPI:
         Returns:
             List of trial dictionaries
         """
-        logger.info(f"Searching CTRI India for: {query}")
+        logger.info("Searching CTRI India for: %s", query)
         
         try:
             # CTRI India search (simplified implementation)
@@ -579,11 +693,11 @@ class TrialScopeAPI:
                 }
                 trials.append(trial)
             
-            logger.info(f"Found {len(trials)} trials from CTRI India")
+            logger.info("Found %s trials from CTRI India", len(trials))
             return trials
             
         except Exception as e:
-            logger.error(f"CTRI India search failed: {e}")
+            logger.error("CTRI India search failed: %s", e)
             return []
     
     def classify_with_ai(self, trials: List[Dict], query: str) -> List[Dict]:
@@ -605,80 +719,149 @@ class TrialScopeAPI:
                 trial['confidence'] = 75
             return trials
         
-        logger.info("Classifying trials with Anthropic AI")
+        # Replay earlier classifications for this query; only misses go to the API
+        pending = []
+        now = time.monotonic()
+        for trial in trials:
+            cached = self._ai_cache.get(self._ai_cache_key(trial, query))
+            if cached and now - cached[0] < SEARCH_CACHE_TTL:
+                trial.update(cached[1])
+            else:
+                pending.append(trial)
+        
+        logger.info("Classifying trials with Anthropic AI (%s cached, %s to classify)",
+                    len(trials) - len(pending), len(pending))
+        if not pending:
+            return trials
         
         try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=self.anthropic_api_key)
+            client = self._get_anthropic_client()
             
-            for i, trial in enumerate(trials):
+            # Classify in batches: one request per AI_BATCH_SIZE trials,
+            # with up to AI_MAX_CONCURRENCY requests in flight at once
+            starts = range(0, len(pending), AI_BATCH_SIZE)
+            with ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY) as executor:
+                futures = [
+                    executor.submit(self._classify_batch, client, pending[start:start + AI_BATCH_SIZE], query)
+                    for start in starts
+                ]
+            
+            for start, future in zip(starts, futures):
+                batch = pending[start:start + AI_BATCH_SIZE]
                 try:
-                    # Prepare classification prompt
-                    prompt = f"""
-                    Analyze this clinical trial for relevance to the query: "{query}"
-                    
-                    Trial Title: {trial.get('title', '')}
-                    Conditions: {trial.get('conditions', '')}
-                    Abstract: {trial.get('abstract', '')[:500]}...
-                    
-                    Provide a JSON response with:
-                    - relevance_score: 0-100 (how relevant to the query)
-                    - classification: "Highly Relevant", "Relevant", or "Less Relevant" 
-                    - confidence: 0-100 (confidence in classification)
-                    - reasoning: Brief explanation
-                    """
-                    
-                    response = client.messages.create(
-                        model="claude-sonnet-4-20250514",
-                        max_tokens=500,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                    
-                    # Parse AI response
-                    ai_text = response.content[0].text
-                    
-                    # Extract JSON from response
-                    try:
-                        # Look for JSON block
-                        json_match = re.search(r'\{.*?\}', ai_text, re.DOTALL)
-                        if json_match:
-                            ai_result = json.loads(json_match.group())
-                            trial['ai_score'] = ai_result.get('relevance_score', 75)
-                            trial['ai_classification'] = ai_result.get('classification', 'Relevant')
-                            trial['confidence'] = ai_result.get('confidence', 75)
-                            trial['ai_reasoning'] = ai_result.get('reasoning', 'AI analysis completed')
-                        else:
-                            raise ValueError("No JSON found in response")
-                    except:
-                        # Fallback scoring
-                        trial['ai_score'] = 75
-                        trial['ai_classification'] = 'Relevant'
-                        trial['confidence'] = 70
-                        trial['ai_reasoning'] = 'Default classification applied'
-                    
-                    # Rate limiting
-                    if i > 0 and i % 5 == 0:
-                        time.sleep(1)
-                        
+                    classified = future.result()
                 except Exception as e:
-                    logger.warning(f"AI classification failed for trial {i}: {e}")
-                    trial['ai_score'] = 70
-                    trial['ai_classification'] = 'Relevant'
-                    trial['confidence'] = 65
-                    trial['ai_reasoning'] = 'Classification error, default applied'
+                    logger.warning("AI classification failed for trials %s-%s: %s", start, start + len(batch) - 1, e)
+                    for trial in batch:
+                        trial['ai_score'] = 70
+                        trial['ai_classification'] = 'Relevant'
+                        trial['confidence'] = 65
+                        trial['ai_reasoning'] = 'Classification error, default applied'
+                    continue
+                
+                # Only genuine AI results are cached; fallback scores are retried next time
+                for trial in classified:
+                    self._cache_store(self._ai_cache, self._ai_cache_key(trial, query),
+                                      {field: trial[field] for field in AI_RESULT_FIELDS},
+                                      AI_CACHE_MAX_ENTRIES)
             
             logger.info("AI classification completed")
             return trials
             
         except Exception as e:
-            logger.error(f"AI classification failed: {e}")
+            logger.error("AI classification failed: %s", e)
             # Return trials with default scores
-            for trial in trials:
+            for trial in pending:
                 trial['ai_score'] = 75
                 trial['ai_classification'] = 'Relevant'
                 trial['confidence'] = 70
             return trials
     
+    def _get_anthropic_client(self):
+        """
+        Return the Anthropic client, creating it on first use
+        
+        The client holds its own connection pool, so reusing it across
+        searches avoids repeating client setup and TLS handshakes.
+        """
+        if self._anthropic_client is None:
+            if anthropic is None:
+                raise ImportError("Install the anthropic package to enable AI classification")
+            # Bound each request so a stalled connection falls back to defaults
+            self._anthropic_client = anthropic.Anthropic(
+                api_key=self.anthropic_api_key, timeout=AI_REQUEST_TIMEOUT
+            )
+        return self._anthropic_client
+    
+    @staticmethod
+    def _ai_cache_key(trial: Dict, query: str) -> tuple:
+        """Identify a trial for the classification cache"""
+        # Placeholder URLs ('N/A') are shared by many records, so the key
+        # includes source and title as well
+        return (query, trial.get('source'), trial.get('url'), trial.get('title', ''))
+    
+    def _classify_batch(self, client, batch: List[Dict], query: str) -> List[Dict]:
+        """
+        Classify a batch of trials with a single Anthropic request
+        
+        Args:
+            client: Anthropic client
+            batch: Trials to classify (updated in place)
+            query: Original search query
+            
+        Returns:
+            Trials that received an AI result (the rest get fallback scores)
+        """
+        # Number the trials so results can be matched back regardless of order
+        trial_blocks = "\n".join(
+            f"Trial {i}:\n"
+            f"Trial Title: {trial.get('title', '')}\n"
+            f"Conditions: {trial.get('conditions', '')}\n"
+            f"Abstract: {trial.get('abstract', '')[:500]}...\n"
+            for i, trial in enumerate(batch, 1)
+        )
+        
+        prompt = f'Query: "{query}"\n\n{trial_blocks}'
+        
+        response = client.messages.create(
+            model="claude-sonnet-4-20250514",
+            max_tokens=4096,
+            system=AI_SYSTEM_PROMPT,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        
+        # Parse AI response
+        ai_text = response.content[0].text
+        
+        # Extract JSON array from response
+        ai_results = {}
+        try:
+            json_match = JSON_ARRAY_RE.search(ai_text)
+            if json_match:
+                for ai_result in json.loads(json_match.group()):
+                    ai_results[str(ai_result.get('id'))] = ai_result
+        except (ValueError, AttributeError) as e:
+            logger.warning("Could not parse AI batch response: %s", e)
+        
+        classified = []
+        for i, trial in enumerate(batch, 1):
+            ai_result = ai_results.get(str(i))
+            if ai_result:
+                # Keep scores numeric so results can be sorted on them directly
+                score = ai_result.get('relevance_score')
+                trial['ai_score'] = score if isinstance(score, (int, float)) else 75
+                trial['ai_classification'] = ai_result.get('classification', 'Relevant')
+                trial['confidence'] = ai_result.get('confidence', 75)
+                trial['ai_reasoning'] = ai_result.get('reasoning', 'AI analysis completed')
+                classified.append(trial)
+            else:
+                # Fallback scoring
+                trial['ai_score'] = 75
+                trial['ai_classification'] = 'Relevant'
+                trial['confidence'] = 70
+                trial['ai_reasoning'] = 'Default classification applied'
+        return classified
+    
     def search_trials(self, query: str, max_results: int = 50, include_academic: bool = True, 
                      include_international: bool = True, use_ai_classification: bool = True, 
                      selected_registries: List[str] = None) -> List[Dict]:
@@ -696,67 +879,116 @@ class TrialScopeAPI:
         Returns:
             Combined and classified results
         """
-        logger.info(f"Starting comprehensive multi-registry search for: {query}")
+        cache_key = (query, max_results, include_academic, include_international,
+                     use_ai_classification, tuple(selected_registries or ()))
+        cached = self._search_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            logger.info("Returning cached results for: %s", query)
+            # Callers may edit or re-classify results, so hand out fresh copies
+            return [dict(trial) for trial in cached[1]]
+        
+        logger.info("Starting comprehensive multi-registry search for: %s", query)
         
         all_trials = []
         results_per_source = max(max_results // 8, 5)  # Distribute across sources
         
         # Primary Registry: ClinicalTrials.gov
-        try:
-            ct_trials = self.search_clinicaltrials_gov(query, max_results)
-            all_trials.extend(ct_trials)
-            logger.info(f"ClinicalTrials.gov: {len(ct_trials)} results")
-        except Exception as e:
-            logger.error(f"ClinicalTrials.gov search failed: {e}")
+        sources = [('ClinicalTrials.gov', self.search_clinicaltrials_gov, max_results)]
         
         # International Registries
         if include_international:
-            registry_searches = [
-                ('WHO ICTRP', self.search_who_ictrp),
-                ('EU CTIS', self.search_eu_ctis),
-                ('ISRCTN', self.search_isrctn_registry),
-                ('ANZCTR', self.search_anzctr_registry),
-                ('CTRI India', self.search_ctri_india)
+            sources += [
+                ('WHO ICTRP', self.search_who_ictrp, results_per_source),
+                ('EU CTIS', self.search_eu_ctis, results_per_source),
+                ('ISRCTN', self.search_isrctn_registry, results_per_source),
+                ('ANZCTR', self.search_anzctr_registry, results_per_source),
+                ('CTRI India', self.search_ctri_india, results_per_source)
             ]
-            
-            for registry_name, search_func in registry_searches:
-                try:
-                    registry_trials = search_func(query, results_per_source)
-                    all_trials.extend(registry_trials)
-                    logger.info(f"{registry_name}: {len(registry_trials)} results")
-                    time.sleep(0.5)  # Rate limiting between registries
-                except Exception as e:
-                    logger.error(f"{registry_name} search failed: {e}")
         
         # Academic Literature
         if include_academic:
-            try:
-                pubmed_papers = self.search_pubmed_related(query, results_per_source)
-                all_trials.extend(pubmed_papers)
-                logger.info(f"PubMed: {len(pubmed_papers)} results")
-            except Exception as e:
-                logger.error(f"PubMed search failed: {e}")
-            
-            try:
-                scholar_papers = self.search_google_scholar(query, results_per_source)
-                all_trials.extend(scholar_papers)
-                logger.info(f"Google Scholar: {len(scholar_papers)} results")
-            except Exception as e:
-                logger.error(f"Google Scholar search failed: {e}")
+            sources += [
+                ('PubMed', self.search_pubmed_related, results_per_source),
+                ('Google Scholar', self.search_google_scholar, results_per_source)
+            ]
+        
+        # Sources are independent HTTP round-trips, so query them concurrently.
+        # Progress is reported as sources finish; results are merged in source
+        # order to keep deduplication deterministic.
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {
+                executor.submit(self._search_one_registry, name, search_func, query, limit): name
+                for name, search_func, limit in sources
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                logger.info("%s finished (%s/%s sources)", futures[future], done, len(futures))
+            for future in futures:
+                all_trials.extend(future.result())
         
         # Remove duplicates based on title similarity
         all_trials = self.deduplicate_trials(all_trials)
         
-        # AI Classification
+        # AI Classification, then sort by AI score. Unscored results all share
+        # the same key, so sorting them would only walk the list to keep order.
         if use_ai_classification:
             all_trials = self.classify_with_ai(all_trials, query)
+            # classify_with_ai sets a numeric ai_score on every trial
+            all_trials.sort(key=itemgetter('ai_score'), reverse=True)
         
-        # Sort by AI score
-        all_trials.sort(key=lambda x: x.get('ai_score', 0), reverse=True)
-        
-        logger.info(f"Multi-registry search completed. Found {len(all_trials)} total unique results")
+        logger.info("Multi-registry search completed. Found %s total unique results", len(all_trials))
+        self._cache_store(self._search_cache, cache_key, [dict(trial) for trial in all_trials])
         return all_trials
     
+    def _search_one_registry(self, name: str, search_func, query: str, max_results: int) -> List[Dict]:
+        """
+        Run a single source search, logging and swallowing failures
+        
+        Args:
+            name: Display name of the source
+            search_func: Bound search method for the source
+            query: Search query
+            max_results: Maximum results to return
+            
+        Returns:
+            List of trial dictionaries (empty on failure)
+        """
+        cache_key = (name, query, max_results)
+        cached = self._source_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            logger.info("%s: %s cached results", name, len(cached[1]))
+            # Callers annotate trials in place, so hand out fresh copies
+            return [dict(trial) for trial in cached[1]]
+        
+        try:
+            trials = search_func(query, max_results)
+            logger.info("%s: %s results", name, len(trials))
+        except Exception as e:
+            logger.error("%s search failed: %s", name, e)
+            return []
+        
+        # Source searches return [] on failure, so only cache actual results
+        if trials:
+            self._cache_store(self._source_cache, cache_key, [dict(trial) for trial in trials])
+        return trials
+    
+    def _cache_store(self, cache: Dict[tuple, tuple], key: tuple, value: Any,
+                     max_entries: int = SEARCH_CACHE_MAX_ENTRIES) -> None:
+        """
+        Store a timestamped cache entry, evicting the oldest once the cache is full
+        
+        Args:
+            cache: Cache dict mapping key -> (timestamp, results)
+            key: Cache key
+            value: Results to cache
+            max_entries: Maximum entries kept in the cache
+        """
+        with self._cache_lock:
+            # Re-inserting moves the key to the end, so dict order stays oldest-first
+            cache.pop(key, None)
+            while len(cache) >= max_entries:
+                cache.pop(next(iter(cache), None), None)
+            cache[key] = (time.monotonic(), value)
+    
     def deduplicate_trials(self, trials: List[Dict]) -> List[Dict]:
         """
         Remove duplicate trials based on title similarity
@@ -771,7 +1003,8 @@ class TrialScopeAPI:
             return trials
         
         unique_trials = []
-        seen_titles = set()
+        # Word sets of kept titles, split once when the trial is kept
+        seen_word_sets = []
         
         for trial in trials:
             title = trial.get('title', '').lower().strip()
@@ -780,8 +1013,7 @@ class TrialScopeAPI:
             title_words = set(title.split())
             is_duplicate = False
             
-            for seen_title in seen_titles:
-                seen_words = set(seen_title.split())
+            for seen_words in seen_word_sets:
                 # Consider duplicate if 80% of words overlap
                 overlap = len(title_words & seen_words) / max(len(title_words), len(seen_words), 1)
                 if overlap > 0.8:
@@ -790,9 +1022,9 @@ class TrialScopeAPI:
             
             if not is_duplicate:
                 unique_trials.append(trial)
-                seen_titles.add(title)
+                seen_word_sets.append(title_words)
         
-        logger.info(f"Deduplication: {len(trials)} -> {len(unique_trials)} unique trials")
+        logger.info("Deduplication: %s -> %s unique trials", len(trials), len(unique_trials))
         return unique_trials
     
     def export_to_excel(self, trials: List[Dict], filename: str = None) -> str:
@@ -810,57 +1042,47 @@ class TrialScopeAPI:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"clinical_trials_search_{timestamp}.xlsx"
         
-        logger.info(f"Exporting {len(trials)} results to {filename}")
+        logger.info("Exporting %s results to %s", len(trials), filename)
         
-        # Prepare data for Excel
-        excel_data = []
-        for trial in trials:
-            row = {
-                'Title': trial.get('title', 'N/A'),
-                'URL': trial.get('url', 'N/A'),
-                'Source': trial.get('source', 'N/A'),
-                'Abstract': trial.get('abstract', 'N/A'),
-                'AI_Score': trial.get('ai_score', 'N/A'),
-                'AI_Classification': trial.get('ai_classification', 'N/A'),
-                'Confidence': trial.get('confidence', 'N/A'),
-                'Conditions': trial.get('conditions', 'N/A'),
-                'Phase': trial.get('phase', 'N/A'),
-                'Status': trial.get('status', 'N/A'),
-                'Start_Date': trial.get('start_date', 'N/A'),
-                'Sponsor': trial.get('sponsor', 'N/A'),
-                'Interventions': trial.get('interventions', 'N/A'),
-                'NCT_ID': trial.get('nct_id', trial.get('pmid', 'N/A'))
-            }
-            excel_data.append(row)
+        # Build the sheet column-wise in one DataFrame construction
+        records = pd.DataFrame.from_records(trials)
+        df = records.reindex(columns=list(EXCEL_COLUMNS))
+        if 'pmid' in records:
+            # Literature rows carry a PubMed ID in place of an NCT ID
+            df['nct_id'] = df['nct_id'].fillna(records['pmid'])
+        df = df.fillna('N/A').rename(columns=EXCEL_COLUMNS)
         
-        # Create DataFrame and export
-        df = pd.DataFrame(excel_data)
+        if get_column_letter is None:
+            raise ImportError("Install the openpyxl package to enable Excel export")
         
         # Create Excel file with formatting
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
             df.to_excel(writer, sheet_name='Clinical Trials', index=False)
             
-            # Get workbook and worksheet for formatting
-            workbook = writer.book
+            # Get worksheet for formatting
             worksheet = writer.sheets['Clinical Trials']
             
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
+            # Auto-adjust column widths from the frame instead of walking every cell
+            for index, header in enumerate(df.columns, start=1):
+                max_length = int(df[header].astype(str).str.len().max() if len(df) else 0)
+                max_length = max(max_length, len(header))
                 adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+                worksheet.column_dimensions[get_column_letter(index)].width = adjusted_width
         
-        logger.info(f"Excel file created successfully: {filename}")
+        logger.info("Excel file created successfully: %s", filename)
         return filename
 
 # Example usage functions for Colab
+@lru_cache(maxsize=4)
+def get_api(anthropic_api_key: str = None, serpapi_key: str = None) -> TrialScopeAPI:
+    """
+    Return a shared API client for the given keys
+    
+    Reusing the client keeps its HTTP session and search cache warm
+    between calls to search_and_export.
+    """
+    return TrialScopeAPI(anthropic_api_key=anthropic_api_key, serpapi_key=serpapi_key)
+
 def search_and_export(query: str, anthropic_api_key: str = None, serpapi_key: str = None, 
                      max_results: int = 50, filename: str = None, include_international: bool = True, 
                      include_academic: bool = True):
@@ -895,11 +1117,8 @@ def search_and_export(query: str, anthropic_api_key: str = None, serpapi_key: st
         if serpapi_key:
             print("   • Google Scholar (Academic Papers)")
     
-    # Initialize API with all keys
-    api = TrialScopeAPI(
-        anthropic_api_key=anthropic_api_key,
-        serpapi_key=serpapi_key
-    )
+    # Initialize API with all keys (reused across calls so its cache persists)
+    api = get_api(anthropic_api_key, serpapi_key)
     
     # Comprehensive search
     results = api.search_trials(
@@ -918,13 +1137,10 @@ def search_and_export(query: str, anthropic_api_key: str = None, serpapi_key: st
     print(f"💾 Results exported to: {excel_file}")
     
     # Summary by source
-    sources = {}
-    for trial in results:
-        source = trial.get('source', 'Unknown')
-        sources[source] = sources.get(source, 0) + 1
+    sources = Counter(trial.get('source', 'Unknown') for trial in results)
     
     print("\n📈 Results by source:")
-    for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True):
+    for source, count in sources.most_common():
         print(f"   • {source}: {count} trials")
     
     return excel_file
@@ -5,22 +5,47 @@ Redesigned to match the exact UI from the provided screenshot
 """
 
 import streamlit as st
+import streamlit.components.v1 as components
 import requests
 import json
 import logging
+import os
+import re
 import time
+from collections import ChainMap
 from typing import Dict, List, Any, Optional
 import base64
 from datetime import datetime
 from pathlib import Path
 
-# Configure logging
+# Configure logging (TRIALSCOPE_LOG_LEVEL=WARNING silences per-rerun info logs)
+_LOG_LEVEL = os.environ.get('TRIALSCOPE_LOG_LEVEL', 'INFO').upper()
+if not isinstance(logging.getLevelName(_LOG_LEVEL), int):
+    _LOG_LEVEL = 'INFO'  # unknown level names would make basicConfig raise
 logging.basicConfig(
-    level=logging.INFO,
+    level=_LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Demo pacing for the simulated search; off unless explicitly requested
+SIMULATE_LATENCY = os.environ.get("TRIALSCOPE_SIMULATE_LATENCY", "").lower() in ("1", "true", "yes")
+
+# Whitespace between tags is shipped verbatim to the browser on every rerun
+_WS = re.compile(r'>\s+<')
+_SPACES = re.compile(r'\s+')
+
+def _min(html: str) -> str:
+    """Strip inter-tag whitespace and collapse indentation in static HTML"""
+    return _SPACES.sub(' ', _WS.sub('><', html)).strip()
+
+_CSS_COMMENTS = re.compile(r'/\*.*?\*/', re.S)
+_CSS_PUNCT = re.compile(r'\s*([{};,])\s*')
+
+def _min_css(css: str) -> str:
+    """Drop comments and whitespace around CSS punctuation"""
+    return _CSS_PUNCT.sub(r'\1', _min(_CSS_COMMENTS.sub('', css)))
+
 # Page configuration with custom favicon
 st.set_page_config(
     page_title="TrialScope AI - Clinical Trial Intelligence Platform",
@@ -35,109 +60,111 @@ st.set_page_config(
 )
 
 # Complete Professional UI Redesign
+THEME_CSS = Path(__file__).parent / "assets" / "theme.css"
+# Resolved next to this file so the cached header does not depend on the launch directory
+LOGO_PATH = Path(__file__).parent / "logo.png"
+LOGO_FALLBACK_PATH = Path(__file__).parent / "attached_assets" / "generated-image_1755531828351.png"
+
+@st.cache_resource
+def _css() -> str:
+    """Read and minify the global stylesheet once per server process"""
+    return _min_css(f"<style>\n{THEME_CSS.read_text(encoding='utf-8')}\n</style>")
+
 def load_css():
-    st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
-    
-    /* Hide Streamlit default elements */
-    .stDeployButton {display:none;}
-    footer {visibility: hidden;}
-    .stApp > header {visibility: hidden;}
-    .stMainMenu {visibility: hidden;}
-    
-    /* Professional Clean Background */
-    .stApp {
-        background: linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%);
-        color: #1e293b;
-        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        min-height: 100vh;
-    }
-    
-    .main .block-container {
-        padding-top: 1rem;
-        max-width: 1200px;
-        padding-left: 2rem;
-        padding-right: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Professional Header */
-    .main-header {
-        background: linear-gradient(135deg, #1e40af 0%, #06b6d4 100%);
-        color: white;
-        padding: 3rem 2rem;
-        border-radius: 16px;
-        margin-bottom: 3rem;
-        text-align: center;
-        box-shadow: 0 8px 32px rgba(6, 182, 212, 0.3);
-    }
+    # Re-emitted every run: Streamlit drops elements a rerun does not redraw
+    st.markdown(_css(), unsafe_allow_html=True)
+
+def load_logo():
+    """Load and encode the TrialScope AI logo"""
+    try:
+        # Try the new logo first
+        if LOGO_PATH.exists():
+            with open(LOGO_PATH, "rb") as f:
+                return base64.b64encode(f.read()).decode()
+        
+        # Fallback to attached assets
+        if LOGO_FALLBACK_PATH.exists():
+            with open(LOGO_FALLBACK_PATH, "rb") as f:
+                return base64.b64encode(f.read()).decode()
+                
+    except Exception as e:
+        logger.warning("Could not load logo: %s", e)
+    return None
+
+# Fallback with molecular structure icon
+_LOGO_FALLBACK_HTML = _min("""
+<div style="width: 80px; height: 80px; background: linear-gradient(135deg, #06b6d4, #0891b2); 
+            border-radius: 16px; display: flex; align-items: center; justify-content: center; 
+            box-shadow: 0 8px 24px rgba(0, 0, 0, 0.2);">
+    <div style="display: flex; flex-direction: column; align-items: center; gap: 4px;">
+        <div style="display: flex; gap: 4px;">
+            <div style="width: 8px; height: 8px; background: white; border-radius: 50%;"></div>
+            <div style="width: 6px; height: 6px; background: rgba(255,255,255,0.8); border-radius: 50%;"></div>
+            <div style="width: 8px; height: 8px; background: white; border-radius: 50%;"></div>
+        </div>
+        <div style="width: 2px; height: 12px; background: white;"></div>
+        <div style="width: 10px; height: 8px; background: white; border-radius: 50%;"></div>
+    </div>
+</div>
+""")
+
+_HEADER_TEMPLATE = _min("""
+<div class="main-header">
+    <div class="logo-container">
+        {logo}
+        <div>
+            <h1 class="brand-title">TrialScope AI</h1>
+            <p class="brand-subtitle">Global Clinical Trial Intelligence Platform</p>
+        </div>
+    </div>
+    <div class="header-stats">
+        <div class="stat-item">
+            <span class="stat-number">16</span>
+            <span class="stat-label">Global Registries</span>
+        </div>
+        <div class="stat-item">
+            <span class="stat-number">1M+</span>
+            <span class="stat-label">Clinical Trials</span>
+        </div>
+        <div class="stat-item">
+            <span class="stat-number">180M+</span>
+            <span class="stat-label">Research Papers</span>
+        </div>
+    </div>
+</div>
+""")
+
+@st.cache_resource
+def _header_html() -> str:
+    """Build the header once per server process; the inlined logo alone is ~2 MB"""
+    logo_base64 = load_logo()
     
-    .logo-container {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        gap: 1.5rem;
-        margin-bottom: 2rem;
-    }
+    if logo_base64:
+        logo_html = f'<img src="data:image/png;base64,{logo_base64}" class="logo-img" alt="TrialScope AI Logo">'
+    else:
+        logo_html = _LOGO_FALLBACK_HTML
     
-    .logo-img {
-        width: 80px;
-        height: 80px;
-        border-radius: 16px;
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.2);
-    }
+    return _HEADER_TEMPLATE.format(logo=logo_html)
+
+def render_main_header():
+    """Render the professional main header with large logo"""
+    st.markdown(_header_html(), unsafe_allow_html=True)
+
+# The registry grid renders inside a component iframe, so it carries its own styles
+_API_GRID_CSS = _min("""
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
     
-    .brand-title {
-        font-size: 3.5rem;
-        font-weight: 800;
+    body {
         margin: 0;
-        background: linear-gradient(135deg, #ffffff 0%, #e2e8f0 100%);
-        background-clip: text;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    
-    .brand-subtitle {
-        font-size: 1.3rem;
-        font-weight: 500;
-        opacity: 0.9;
-        margin: 0.5rem 0 0 0;
-    }
-    
-    .header-stats {
-        display: flex;
-        justify-content: center;
-        gap: 3rem;
-        margin-top: 2rem;
-        flex-wrap: wrap;
-    }
-    
-    .stat-item {
-        text-align: center;
-    }
-    
-    .stat-number {
-        font-size: 2.5rem;
-        font-weight: 800;
-        color: #f0f9ff;
-        display: block;
-    }
-    
-    .stat-label {
-        font-size: 0.9rem;
-        opacity: 0.8;
-        margin-top: 0.25rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
+        font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
     }
     
-    /* API Connection Grid */
     .api-grid {
         display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
+        grid-template-columns: repeat(4, minmax(0, 1fr));
         gap: 1.5rem;
-        margin: 2rem 0;
+        margin: 0.25rem 0;
     }
     
     .api-card {
@@ -162,6 +189,8 @@ def load_css():
     
     .api-header {
         display: flex;
+        flex-wrap: wrap;
+        gap: 0.5rem;
         justify-content: space-between;
         align-items: center;
         margin-bottom: 1rem;
@@ -200,6 +229,8 @@ def load_css():
     
     .api-stats {
         display: flex;
+        flex-wrap: wrap;
+        gap: 0.5rem;
         justify-content: space-between;
         align-items: center;
     }
@@ -218,220 +249,74 @@ def load_css():
         border-radius: 6px;
     }
     
-    /* Database Selection Section */
-    .database-selection {
-        background: white;
-        border: 2px solid #e2e8f0;
-        border-radius: 16px;
-        padding: 2rem;
-        margin: 2rem 0;
-        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.05);
-    }
-    
-    .section-title {
-        font-size: 1.8rem;
-        font-weight: 700;
-        color: #1e293b;
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-    
-    .section-subtitle {
-        font-size: 1rem;
-        color: #64748b;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .database-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 1rem;
-        margin: 1.5rem 0;
-    }
-    
-    .database-card {
-        background: #f8fafc;
-        border: 2px solid #e2e8f0;
-        border-radius: 8px;
-        padding: 1rem;
-        cursor: pointer;
-        transition: all 0.3s ease;
-    }
-    
-    .database-card:hover {
-        border-color: #06b6d4;
-        background: #f0f9ff;
-    }
-    
-    .database-card.selected {
-        border-color: #1e40af;
-        background: linear-gradient(135deg, #dbeafe 0%, #f0f9ff 100%);
-    }
-    
-    .database-name {
-        font-weight: 600;
-        color: #1e293b;
-        margin-bottom: 0.5rem;
-    }
-    
-    .database-info {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        font-size: 0.875rem;
-        color: #64748b;
-    }
-    
-    .database-trials {
-        color: #1e40af;
-        font-weight: 600;
-    }
-    
-    /* Search Interface */
-    .search-section {
-        background: white;
-        border: 2px solid #e2e8f0;
-        border-radius: 16px;
-        padding: 2rem;
-        margin: 2rem 0;
-        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.05);
-    }
-    
-    /* Streamlit Component Styling */
-    .stTextInput > div > div > input {
-        background: #f8fafc !important;
-        border: 2px solid #e2e8f0 !important;
-        border-radius: 8px !important;
-        color: #1e293b !important;
-        font-size: 1rem !important;
-        padding: 0.75rem 1rem !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #06b6d4 !important;
-        box-shadow: 0 0 0 3px rgba(6, 182, 212, 0.1) !important;
-        outline: none !important;
-    }
-    
-    .stSelectbox > div > div {
-        background: #f8fafc !important;
-        border: 2px solid #e2e8f0 !important;
-        border-radius: 8px !important;
-    }
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #1e40af 0%, #06b6d4 100%) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 8px !important;
-        padding: 0.75rem 2rem !important;
-        font-weight: 600 !important;
-        font-size: 1rem !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 12px rgba(6, 182, 212, 0.3) !important;
-        width: 100% !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 20px rgba(6, 182, 212, 0.4) !important;
+    @media (max-width: 1000px) {
+        .api-grid {
+            grid-template-columns: repeat(2, minmax(0, 1fr));
+        }
     }
     
-    /* Responsive Design */
     @media (max-width: 768px) {
-        .brand-title {
-            font-size: 2.5rem;
-        }
-        
-        .header-stats {
-            gap: 1.5rem;
-        }
-        
-        .stat-number {
-            font-size: 2rem;
-        }
-        
-        .api-grid, .database-grid {
+        .api-grid {
             grid-template-columns: 1fr;
         }
-        
-        .main .block-container {
-            padding-left: 1rem;
-            padding-right: 1rem;
-        }
     }
 </style>
-""", unsafe_allow_html=True)
-def load_logo():
-    """Load and encode the TrialScope AI logo"""
-    try:
-        # Try the new logo first
-        logo_path = Path("logo.png")
-        if logo_path.exists():
-            with open(logo_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
-        
-        # Fallback to attached assets
-        fallback_path = Path("attached_assets/generated-image_1755531828351.png")
-        if fallback_path.exists():
-            with open(fallback_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
-                
-    except Exception as e:
-        logger.warning(f"Could not load logo: {e}")
-    return None
+""")
 
-def render_main_header():
-    """Render the professional main header with large logo"""
-    logo_base64 = load_logo()
-    
-    if logo_base64:
-        logo_html = f'<img src="data:image/png;base64,{logo_base64}" class="logo-img" alt="TrialScope AI Logo">'
-    else:
-        # Fallback with molecular structure icon
-        logo_html = '''
-        <div style="width: 80px; height: 80px; background: linear-gradient(135deg, #06b6d4, #0891b2); 
-                    border-radius: 16px; display: flex; align-items: center; justify-content: center; 
-                    box-shadow: 0 8px 24px rgba(0, 0, 0, 0.2);">
-            <div style="display: flex; flex-direction: column; align-items: center; gap: 4px;">
-                <div style="display: flex; gap: 4px;">
-                    <div style="width: 8px; height: 8px; background: white; border-radius: 50%;"></div>
-                    <div style="width: 6px; height: 6px; background: rgba(255,255,255,0.8); border-radius: 50%;"></div>
-                    <div style="width: 8px; height: 8px; background: white; border-radius: 50%;"></div>
-                </div>
-                <div style="width: 2px; height: 12px; background: white;"></div>
-                <div style="width: 10px; height: 8px; background: white; border-radius: 50%;"></div>
-            </div>
-        </div>
-        '''
-    
-    st.markdown(f"""
-    <div class="main-header">
-        <div class="logo-container">
-            {logo_html}
-            <div>
-                <h1 class="brand-title">TrialScope AI</h1>
-                <p class="brand-subtitle">Global Clinical Trial Intelligence Platform</p>
-            </div>
-        </div>
-        <div class="header-stats">
-            <div class="stat-item">
-                <span class="stat-number">16</span>
-                <span class="stat-label">Global Registries</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-number">1M+</span>
-                <span class="stat-label">Clinical Trials</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-number">180M+</span>
-                <span class="stat-label">Research Papers</span>
-            </div>
-        </div>
+_API_CARD_TMPL = _min("""
+<div class="{card_class}">
+    <div class="api-header">
+        <div class="api-name">{name}</div>
+        <span class="api-status {status_class}">{status_text}</span>
     </div>
-    """, unsafe_allow_html=True)
+    <div class="api-info">{description}</div>
+    <div class="api-stats">
+        <span class="trial-count">{trials}</span>
+        <span class="api-region">{region}</span>
+    </div>
+</div>
+""")
+
+# All 16 APIs with real status and trial counts
+REGISTRIES = [
+    {"name": "ClinicalTrials.gov", "region": "United States", "trials": "450,000+", "status": "connected", "description": "FDA primary registry"},
+    {"name": "WHO ICTRP", "region": "Global Network", "trials": "500,000+", "status": "connected", "description": "World Health Organization portal"},
+    {"name": "EU CTIS", "region": "European Union", "trials": "85,000+", "status": "connected", "description": "European clinical trials"},
+    {"name": "ISRCTN", "region": "UK/International", "trials": "45,000+", "status": "connected", "description": "International registry"},
+    {"name": "ANZCTR", "region": "Australia/New Zealand", "trials": "18,000+", "status": "connected", "description": "Australia-New Zealand registry"},
+    {"name": "CTRI", "region": "India", "trials": "25,000+", "status": "connected", "description": "Clinical Trials Registry India"},
+    {"name": "DRKS", "region": "Germany", "trials": "15,000+", "status": "connected", "description": "German Clinical Trials Register"},
+    {"name": "jRCT", "region": "Japan", "trials": "12,000+", "status": "connected", "description": "Japan Registry of Clinical Trials"},
+    {"name": "IRCT", "region": "Iran", "trials": "8,000+", "status": "available", "description": "Iranian Registry Clinical Trials"},
+    {"name": "TCTR", "region": "Thailand", "trials": "5,000+", "status": "available", "description": "Thai Clinical Trials Registry"},
+    {"name": "CRiS", "region": "South Korea", "trials": "4,000+", "status": "available", "description": "Clinical Research Information Service"},
+    {"name": "PACTR", "region": "Pan-African", "trials": "2,500+", "status": "available", "description": "Pan African Clinical Trial Registry"},
+    {"name": "PubMed", "region": "Global", "trials": "35M+", "status": "connected", "description": "NCBI Medical Literature"},
+    {"name": "Google Scholar", "region": "Global", "trials": "180M+", "status": "available", "description": "Academic paper database"},
+    {"name": "SLCTR", "region": "Sri Lanka", "trials": "1,500+", "status": "available", "description": "Sri Lanka Clinical Trials Registry"},
+    {"name": "RPCEC", "region": "Cuba", "trials": "3,000+", "status": "available", "description": "Cuban Public Registry"},
+]
+
+# The frame is sized to the 4-column layout; at the 2- and 1-column
+# breakpoints the extra rows scroll inside it
+_API_GRID_COLUMNS = 4
+_API_CARD_HEIGHT = 190  # tallest card, with a wrapped name/badge row
+_API_GRID_GAP = 24  # .api-grid gap: 1.5rem
+_API_GRID_ROWS = -(-len(REGISTRIES) // _API_GRID_COLUMNS)
+# Rows plus gaps, the grid margin and headroom for the hover lift
+_API_GRID_HEIGHT = _API_GRID_ROWS * (_API_CARD_HEIGHT + _API_GRID_GAP) - _API_GRID_GAP + 12
+
+_API_STATUS_FIELDS = {
+    "connected": {"card_class": "api-card connected", "status_class": "status-connected", "status_text": "CONNECTED"},
+    "available": {"card_class": "api-card", "status_class": "status-available", "status_text": "AVAILABLE"},
+}
+
+@st.cache_data
+def _registry_grid_html() -> str:
+    """Build the registry grid component markup once; REGISTRIES never changes"""
+    cards = "".join(_API_CARD_TMPL.format_map(ChainMap(_API_STATUS_FIELDS[api["status"]], api))
+                    for api in REGISTRIES)
+    return f'{_API_GRID_CSS}<div class="api-grid">{cards}</div>'
 
 def render_api_connections():
     """Render the API connections showcase - First section as requested"""
@@ -439,59 +324,24 @@ def render_api_connections():
     <div class="database-selection">
         <h2 class="section-title">🌐 Connected Global Registries</h2>
         <p class="section-subtitle">Live connections to 16 clinical trial registries and academic databases worldwide</p>
-        <div class="api-grid">
+    </div>
     """, unsafe_allow_html=True)
     
-    # All 16 APIs with real status and trial counts
-    apis = [
-        {"name": "ClinicalTrials.gov", "region": "United States", "trials": "450,000+", "status": "connected", "description": "FDA primary registry"},
-        {"name": "WHO ICTRP", "region": "Global Network", "trials": "500,000+", "status": "connected", "description": "World Health Organization portal"},
-        {"name": "EU CTIS", "region": "European Union", "trials": "85,000+", "status": "connected", "description": "European clinical trials"},
-        {"name": "ISRCTN", "region": "UK/International", "trials": "45,000+", "status": "connected", "description": "International registry"},
-        {"name": "ANZCTR", "region": "Australia/New Zealand", "trials": "18,000+", "status": "connected", "description": "Australia-New Zealand registry"},
-        {"name": "CTRI", "region": "India", "trials": "25,000+", "status": "connected", "description": "Clinical Trials Registry India"},
-        {"name": "DRKS", "region": "Germany", "trials": "15,000+", "status": "connected", "description": "German Clinical Trials Register"},
-        {"name": "jRCT", "region": "Japan", "trials": "12,000+", "status": "connected", "description": "Japan Registry of Clinical Trials"},
-        {"name": "IRCT", "region": "Iran", "trials": "8,000+", "status": "available", "description": "Iranian Registry Clinical Trials"},
-        {"name": "TCTR", "region": "Thailand", "trials": "5,000+", "status": "available", "description": "Thai Clinical Trials Registry"},
-        {"name": "CRiS", "region": "South Korea", "trials": "4,000+", "status": "available", "description": "Clinical Research Information Service"},
-        {"name": "PACTR", "region": "Pan-African", "trials": "2,500+", "status": "available", "description": "Pan African Clinical Trial Registry"},
-        {"name": "PubMed", "region": "Global", "trials": "35M+", "status": "connected", "description": "NCBI Medical Literature"},
-        {"name": "Google Scholar", "region": "Global", "trials": "180M+", "status": "available", "description": "Academic paper database"},
-        {"name": "SLCTR", "region": "Sri Lanka", "trials": "1,500+", "status": "available", "description": "Sri Lanka Clinical Trials Registry"},
-        {"name": "RPCEC", "region": "Cuba", "trials": "3,000+", "status": "available", "description": "Cuban Public Registry"},
-    ]
-    
-    # Display in 4 columns
-    cols = st.columns(4)
-    for i, api in enumerate(apis):
-        with cols[i % 4]:
-            status_class = "status-connected" if api["status"] == "connected" else "status-available"
-            card_class = "api-card connected" if api["status"] == "connected" else "api-card"
-            status_text = "CONNECTED" if api["status"] == "connected" else "AVAILABLE"
-            
-            st.markdown(f"""
-            <div class="{card_class}">
-                <div class="api-header">
-                    <div class="api-name">{api['name']}</div>
-                    <span class="api-status {status_class}">{status_text}</span>
-                </div>
-                <div class="api-info">{api['description']}</div>
-                <div class="api-stats">
-                    <span class="trial-count">{api['trials']}</span>
-                    <span class="api-region">{api['region']}</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown("</div></div>", unsafe_allow_html=True)
+    # Display in 4 columns: all 16 cards go out as one component message
+    components.html(_registry_grid_html(), height=_API_GRID_HEIGHT, scrolling=True)
 
+@st.fragment
 def render_database_selection():
-    """Render database selection section - Second section as requested"""
+    """Render database selection section - Second section as requested
+
+    Runs as a fragment so toggling a checkbox only reruns this section,
+    not the header and registry grid above it.
+    """
     st.markdown("""
     <div class="database-selection">
         <h2 class="section-title">📊 Select Databases</h2>
         <p class="section-subtitle">Choose one or more clinical trial registries and academic databases for your search</p>
+    </div>
     """, unsafe_allow_html=True)
     
     # Initialize session state for selections
@@ -541,15 +391,19 @@ def render_database_selection():
         </div>
     </div>
     """, unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
 
+@st.fragment
 def render_search_interface():
-    """Render the complete search interface with all options"""
+    """Render the complete search interface with all options
+
+    Runs as a fragment so submitting the form reruns only the search
+    section and its results, not the header and registry grid.
+    """
     st.markdown("""
     <div class="search-section">
         <h2 class="section-title">🔍 Search Clinical Trials</h2>
         <p class="section-subtitle">Advanced AI-powered search with filtering and academic literature integration</p>
+    </div>
     """, unsafe_allow_html=True)
     
     with st.form("comprehensive_search", clear_on_submit=False):
@@ -623,105 +477,62 @@ def render_search_interface():
             selected_count = len(st.session_state.get('selected_databases', ['ClinicalTrials.gov', 'WHO ICTRP', 'PubMed']))
             st.success(f"🔍 Searching for: **{query}** across {selected_count} databases")
             with st.spinner("AI is analyzing clinical trials across global registries..."):
-                time.sleep(2)  # Simulate processing
+                if SIMULATE_LATENCY:
+                    time.sleep(2)  # Simulate processing
                 st.info("🤖 **AI Analysis Complete** - Found 147 relevant trials with 89% average confidence score")
-    
-    st.markdown("</div>", unsafe_allow_html=True)
 
-def render_footer():
-    """Render footer with professional TrialScope AI branding"""
-    st.markdown("""
-    <div style="background: #1e293b; color: white; margin-top: 4rem; padding: 3rem 2rem 2rem 2rem; border-radius: 16px 16px 0 0;">
-        <div style="text-align: center; margin-bottom: 2rem;">
-            <div style="display: flex; justify-content: center; align-items: center; gap: 1rem; margin-bottom: 1rem;">
-                <div style="width: 40px; height: 40px; background: linear-gradient(135deg, #06b6d4, #0891b2); border-radius: 12px; display: flex; align-items: center; justify-content: center;">
-                    <div style="display: flex; flex-direction: column; align-items: center; gap: 2px;">
-                        <div style="display: flex; gap: 2px;">
-                            <div style="width: 4px; height: 4px; background: white; border-radius: 50%;"></div>
-                            <div style="width: 3px; height: 3px; background: rgba(255,255,255,0.8); border-radius: 50%;"></div>
-                            <div style="width: 4px; height: 4px; background: white; border-radius: 50%;"></div>
-                        </div>
-                        <div style="width: 1px; height: 6px; background: white;"></div>
-                        <div style="width: 5px; height: 4px; background: white; border-radius: 50%;"></div>
+_FOOTER_HTML = _min("""
+<div class="footer-section">
+    <div class="footer-grid">
+        <div>
+            <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 1rem;">
+                <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #06b6d4, #0891b2); border-radius: 6px; display: flex; align-items: center; justify-content: center; font-size: 1rem; color: white; font-weight: bold;">
+                    <div style="display: flex; gap: 1px;">
+                        <div style="width: 4px; height: 4px; background: white; border-radius: 50%;"></div>
+                        <div style="width: 3px; height: 3px; background: rgba(255,255,255,0.8); border-radius: 50%;"></div>
+                        <div style="width: 4px; height: 4px; background: white; border-radius: 50%;"></div>
                     </div>
                 </div>
-                <span style="font-size: 2rem; font-weight: 800; background: linear-gradient(135deg, #06b6d4, #38bdf8); background-clip: text; -webkit-background-clip: text; -webkit-text-fill-color: transparent;">TrialScope AI</span>
+                <h4 style="color: #06b6d4; font-size: 1.2rem; margin: 0;">TrialScope AI</h4>
             </div>
-            <p style="font-size: 1.1rem; margin: 0; opacity: 0.9;">Global Clinical Trial Intelligence Platform</p>
+            <p>Global clinical trial intelligence platform with AI-powered search across 16 registries and 180M+ research papers.</p>
         </div>
-        
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 2rem; margin-bottom: 2rem;">
-            <div style="text-align: center;">
-                <div style="font-size: 2rem; font-weight: 800; color: #06b6d4;">16</div>
-                <div style="font-size: 0.9rem; opacity: 0.8;">Global Registries</div>
-            </div>
-            <div style="text-align: center;">
-                <div style="font-size: 2rem; font-weight: 800; color: #06b6d4;">1M+</div>
-                <div style="font-size: 0.9rem; opacity: 0.8;">Clinical Trials</div>
-            </div>
-            <div style="text-align: center;">
-                <div style="font-size: 2rem; font-weight: 800; color: #06b6d4;">180M+</div>
-                <div style="font-size: 0.9rem; opacity: 0.8;">Research Papers</div>
-            </div>
-            <div style="text-align: center;">
-                <div style="font-size: 2rem; font-weight: 800; color: #06b6d4;">AI</div>
-                <div style="font-size: 0.9rem; opacity: 0.8;">Powered Classification</div>
-            </div>
+        <div>
+            <h4>Platform</h4>
+            <p><a href="#">AI Search</a></p>
+            <p><a href="#">API Access</a></p>
+            <p><a href="#">Analytics</a></p>
+            <p><a href="#">Reports</a></p>
         </div>
-        
-        <div style="text-align: center; padding-top: 2rem; border-top: 1px solid rgba(6, 182, 212, 0.2); font-size: 0.875rem; opacity: 0.7;">
-            Powered by Anthropic Claude AI • Academic Literature via Google Scholar • Professional UI with Streamlit
+        <div>
+            <h4>Resources</h4>
+            <p><a href="#">Documentation</a></p>
+            <p><a href="#">Research Guide</a></p>
+            <p><a href="#">Case Studies</a></p>
+            <p><a href="#">Support</a></p>
+        </div>
+        <div>
+            <h4>Company</h4>
+            <p><a href="#">About</a></p>
+            <p><a href="#">Privacy</a></p>
+            <p><a href="#">Terms</a></p>
+            <p><a href="#">Contact</a></p>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+</div>
+""")
 
 def render_footer():
     """Render the professional footer matching the screenshot"""
-    st.markdown("""
-    <div class="footer-section">
-        <div class="footer-grid">
-            <div>
-                <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 1rem;">
-                    <div style="width: 32px; height: 32px; background: linear-gradient(135deg, #06b6d4, #0891b2); border-radius: 6px; display: flex; align-items: center; justify-content: center; font-size: 1rem; color: white; font-weight: bold;">
-                        <div style="display: flex; gap: 1px;">
-                            <div style="width: 4px; height: 4px; background: white; border-radius: 50%;"></div>
-                            <div style="width: 3px; height: 3px; background: rgba(255,255,255,0.8); border-radius: 50%;"></div>
-                            <div style="width: 4px; height: 4px; background: white; border-radius: 50%;"></div>
-                        </div>
-                    </div>
-                    <h4 style="color: #06b6d4; font-size: 1.2rem; margin: 0;">TrialScope AI</h4>
-                </div>
-                <p>Global clinical trial intelligence platform with AI-powered search across 16 registries and 180M+ research papers.</p>
-            </div>
-            <div>
-                <h4>Platform</h4>
-                <p><a href="#">AI Search</a></p>
-                <p><a href="#">API Access</a></p>
-                <p><a href="#">Analytics</a></p>
-                <p><a href="#">Reports</a></p>
-            </div>
-            <div>
-                <h4>Resources</h4>
-                <p><a href="#">Documentation</a></p>
-                <p><a href="#">Research Guide</a></p>
-                <p><a href="#">Case Studies</a></p>
-                <p><a href="#">Support</a></p>
-            </div>
-            <div>
-                <h4>Company</h4>
-                <p><a href="#">About</a></p>
-                <p><a href="#">Privacy</a></p>
-                <p><a href="#">Terms</a></p>
-                <p><a href="#">Contact</a></p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 def main():
     """Main TrialScope AI application with professional interactive design"""
     try:
-        logger.info("Starting TrialScope AI with professional interactive interface")
+        # main() reruns on every interaction; log the start once per session
+        if not st.session_state.get('_start_logged'):
+            logger.info("Starting TrialScope AI with professional interactive interface")
+            st.session_state['_start_logged'] = True
         
         # Load CSS for professional design
         load_css()
@@ -743,71 +554,8 @@ def main():
         render_footer()
         
     except Exception as e:
-        logger.error(f"Error in main application: {str(e)}", exc_info=True)
+        logger.error("Error in main application: %s", e, exc_info=True)
         st.error("An error occurred. Please refresh the page and try again.")
 
-def render_enhanced_registry_showcase():
-    """Render enhanced registry showcase with real data"""
-    st.markdown("""
-    <div class="results-container">
-        <div style="text-align: center; margin-bottom: 2rem;">
-            <h3 style="color: var(--text-primary); font-size: 1.8rem; font-weight: 700; margin-bottom: 0.5rem;">
-                🌍 Global Clinical Trial Coverage
-            </h3>
-            <p style="color: var(--text-secondary); font-size: 1rem; margin: 0;">
-                Comprehensive access to all major clinical trial registries worldwide
-            </p>
-        </div>
-        <div class="registry-grid">
-    """, unsafe_allow_html=True)
-    
-    # Enhanced registry data with real trial counts
-    registries = [
-        {"name": "ClinicalTrials.gov", "region": "United States", "trials": "450,000+", "status": "🟢 Active", "color": "#10b981"},
-        {"name": "WHO ICTRP", "region": "Global Network", "trials": "500,000+", "status": "🟢 Active", "color": "#3b82f6"},
-        {"name": "EU CTIS", "region": "European Union", "trials": "85,000+", "status": "🟢 Active", "color": "#8b5cf6"},
-        {"name": "ISRCTN", "region": "UK/International", "trials": "45,000+", "status": "🟢 Active", "color": "#06b6d4"},
-        {"name": "ANZCTR", "region": "Australia/New Zealand", "trials": "18,000+", "status": "🟢 Active", "color": "#f59e0b"},
-        {"name": "CTRI", "region": "India", "trials": "25,000+", "status": "🟢 Active", "color": "#ef4444"},
-        {"name": "DRKS", "region": "Germany", "trials": "15,000+", "status": "🟢 Active", "color": "#84cc16"},
-        {"name": "jRCT", "region": "Japan", "trials": "12,000+", "status": "🟢 Active", "color": "#f97316"},
-    ]
-    
-    cols = st.columns(4)
-    for i, registry in enumerate(registries):
-        with cols[i % 4]:
-            st.markdown(f"""
-            <div class="registry-card" style="border-left: 4px solid {registry['color']};">
-                <div style="display: flex; justify-content: between; align-items: start; margin-bottom: 0.75rem;">
-                    <div class="registry-name" style="flex: 1;">{registry['name']}</div>
-                    <div style="font-size: 0.75rem; color: {registry['color']}; font-weight: 600;">{registry['status']}</div>
-                </div>
-                <div style="color: var(--text-muted); font-size: 0.875rem; margin-bottom: 0.5rem;">{registry['region']}</div>
-                <div class="registry-count" style="font-size: 1.1rem; font-weight: 700; color: {registry['color']};">{registry['trials']} trials</div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-    
-    # Add academic sources section
-    st.markdown("""
-        <div style="margin-top: 2rem; text-align: center;">
-            <h4 style="color: var(--text-primary); font-size: 1.3rem; font-weight: 600; margin-bottom: 1rem;">
-                📚 Academic Literature Integration
-            </h4>
-            <div style="display: flex; justify-content: center; gap: 2rem; flex-wrap: wrap;">
-                <div style="background: var(--card-bg); border: 1px solid var(--card-border); border-radius: 8px; padding: 1rem; min-width: 200px;">
-                    <div style="color: var(--accent-blue); font-weight: 700; font-size: 1.2rem;">PubMed</div>
-                    <div style="color: var(--text-muted); font-size: 0.9rem;">NCBI Medical Literature</div>
-                </div>
-                <div style="background: var(--card-bg); border: 1px solid var(--card-border); border-radius: 8px; padding: 1rem; min-width: 200px;">
-                    <div style="color: var(--accent-blue); font-weight: 700; font-size: 1.2rem;">Google Scholar</div>
-                    <div style="color: var(--text-muted); font-size: 0.9rem;">180M+ Academic Papers</div>
-                </div>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
 if __name__ == "__main__":
     main()
\ No newline at end of file